@@ -8,7 +8,9 @@ Run this script as a module from the project root:
 # Import and run the app
 if __name__ == "__main__":
     import os
-    from src.research.app import deep_research_ui
+    from src.research.app import close_research_manager, deep_research_ui
+    
+    # No event loop setup needed: Gradio's uvicorn server picks uvloop automatically when installed
     
     # Get port from environment variable or use default
     port = int(os.environ.get("GRADIO_SERVER_PORT", "7860"))
@@ -17,6 +19,9 @@ if __name__ == "__main__":
     print(f"   (Set GRADIO_SERVER_PORT environment variable to use a specific port)")
     print()
     
-    # Use the facade to launch
-    deep_research_ui.launch(server_port=port)
+    # Use the facade to launch (blocks until the server shuts down)
+    try:
+        deep_research_ui.launch(server_port=port)
+    finally:
+        close_research_manager()
 
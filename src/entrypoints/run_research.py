@@ -38,8 +38,11 @@ async def main() -> None:
     
     manager: ResearchManager = ResearchManager()
     
-    async for update in manager.run(query):
-        print(update)
+    try:
+        async for update in manager.run(query):
+            print(update)
+    finally:
+        await manager.aclose()
     
     print("\n" + "="*70)
     print("✅ Research complete! Check the outputs/ directory for the full report.")
@@ -47,5 +50,10 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Faster drop-in event loop (not available on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
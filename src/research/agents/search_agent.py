@@ -9,10 +9,13 @@ Key Features:
 - Forces tool usage (no hallucinations)
 - Concise, focused summaries
 - Costs ~$0.025 per search
+- Batch variant handles several search terms in one agent call
 
 Note: This tool costs money! See OpenAI pricing for WebSearchTool.
 """
 
+from typing import List
+from pydantic import BaseModel, Field
 from agents import Agent, WebSearchTool, ModelSettings
 
 INSTRUCTIONS = (
@@ -31,3 +34,25 @@ search_agent = Agent(
     model_settings=ModelSettings(tool_choice="required"),  # Always use the tool!
 )
 
+
+BATCH_INSTRUCTIONS = (
+    "You are a research assistant. You are given a numbered list of search terms, each with a reason. "
+    "Search the web for every term and produce one concise summary per term, in the same order as the "
+    "input. Each summary must be 2-3 paragraphs and less than 300 words. Capture the main points. Write "
+    "succintly, no need to have complete sentences or good grammar. Do not merge or skip terms."
+)
+
+
+class SearchSummaries(BaseModel):
+    """One summary per search term, in input order."""
+    summaries: List[str] = Field(description="One summary per numbered search term, in the same order.")
+
+
+batch_search_agent = Agent(
+    name="Batch search agent",
+    instructions=BATCH_INSTRUCTIONS,
+    tools=[WebSearchTool(search_context_size="low")],
+    model="gpt-4o-mini",
+    model_settings=ModelSettings(tool_choice="required"),
+    output_type=SearchSummaries,
+)
@@ -4,7 +4,7 @@ Deep Research Web Application
 Provides a clean interface to the research system using the Gradio UI facade.
 """
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from dotenv import load_dotenv
 from pathlib import Path
 from src.research.research_manager import ResearchManager
@@ -15,6 +15,25 @@ load_dotenv(override=True)
 # Outputs directory - relative to project root
 OUTPUTS_DIR: Path = Path(__file__).parent.parent.parent / "outputs"
 
+# Shared across requests so the HTTP/2 pool, cache connections and embedding index persist
+_research_manager: Optional[ResearchManager] = None
+
+
+def get_research_manager() -> ResearchManager:
+    """Return the process-wide research manager, creating it on first use."""
+    global _research_manager
+    if _research_manager is None:
+        _research_manager = ResearchManager()
+    return _research_manager
+
+
+def close_research_manager() -> None:
+    """Close the shared research manager (call on server shutdown)."""
+    global _research_manager
+    if _research_manager is not None:
+        _research_manager.close()
+        _research_manager = None
+
 
 async def run_research(query: str) -> AsyncGenerator[str, None]:
     """Execute research and yield the final report."""
@@ -22,7 +41,7 @@ async def run_research(query: str) -> AsyncGenerator[str, None]:
         yield "⚠️ Please enter a research query"
         return
     
-    manager: ResearchManager = ResearchManager()
+    manager: ResearchManager = get_research_manager()
     async for report in manager.run(query):
         yield report
 
@@ -39,5 +58,15 @@ def create_deep_research_ui() -> GradioUIFacade:
     return ui_facade
 
 
-# Expose deep_research_ui for backward compatibility with entrypoints
-deep_research_ui: GradioUIFacade = create_deep_research_ui()
+def __getattr__(name: str) -> GradioUIFacade:
+    """
+    Build deep_research_ui lazily on first access (PEP 562).
+    
+    Exposed for backward compatibility with entrypoints; importing this module
+    no longer constructs the Gradio Blocks or scans the outputs directory.
+    """
+    if name == "deep_research_ui":
+        ui_facade: GradioUIFacade = create_deep_research_ui()
+        globals()[name] = ui_facade
+        return ui_facade
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,192 @@
+"""
+Semantic Cache - Persistent Query Memoization
+
+Two-tier cache for agent outputs keyed on a query string:
+1. Exact tier: sha256 of the normalized query → stored value
+2. Semantic tier: embedding cosine similarity against stored queries
+
+Key Features:
+- SQLite storage (no extra services to run), accessed off the event loop
+- Embeddings stored as float32 bytes, loaded once into an in-memory matrix
+  and compared with one vectorized dot product
+- Time-to-live so stale entries are re-fetched
+"""
+
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from openai import AsyncOpenAI
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import numpy as np
+
+EMBEDDING_MODEL: str = "text-embedding-3-small"
+SIMILARITY_THRESHOLD: float = 0.92
+DEFAULT_TTL_DAYS: int = 7
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    value TEXT NOT NULL,
+    embedding BLOB,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class SemanticCache:
+    """SQLite-backed cache with exact-match and embedding-similarity lookup."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_days: int = DEFAULT_TTL_DAYS,
+        similarity_threshold: float = SIMILARITY_THRESHOLD,
+        client: Optional[AsyncOpenAI] = None,
+        semantic: bool = True,
+    ) -> None:
+        """
+        Initialize the cache.
+        Args:
+            db_path: SQLite database file (created if missing)
+            ttl_days: Entries older than this are ignored and re-fetched
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            client: OpenAI client used for embeddings (default client if None)
+            semantic: Enable the embedding tier; False gives an exact-match cache with no API calls
+        """
+        self.db_path: Path = db_path
+        self.semantic: bool = semantic
+        self.ttl_seconds: float = ttl_days * 86400
+        self.similarity_threshold: float = similarity_threshold
+        self._client: Optional[AsyncOpenAI] = client
+        self._pending_embeddings: Dict[str, np.ndarray] = {}
+        # In-memory semantic index: (values, created_at, stacked embeddings), loaded on first use
+        self._index: Optional[Tuple[List[str], np.ndarray, np.ndarray]] = None
+        # Serializes the lazy index load with inserts so neither overwrites the other
+        self._index_lock: asyncio.Lock = asyncio.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Queries run in worker threads (asyncio.to_thread); the lock serializes them
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    @staticmethod
+    def make_key(query: str) -> str:
+        """Hash a normalized query into the exact-match key."""
+        return hashlib.sha256(query.strip().lower().encode("utf-8")).hexdigest()
+
+    async def get(self, query: str) -> Optional[str]:
+        """Return a cached value for the query, or None on a miss."""
+        key: str = self.make_key(query)
+        cutoff: float = time.time() - self.ttl_seconds
+
+        value: Optional[str] = await asyncio.to_thread(self._fetch_exact, key, cutoff)
+        if value is not None or not self.semantic:
+            return value
+
+        embedding: Optional[np.ndarray] = self._pending_embeddings.get(key)
+        if embedding is None:
+            embedding = await self._embed(query)
+            if embedding is None:
+                return None
+            self._pending_embeddings[key] = embedding
+
+        if self._index is None:
+            async with self._index_lock:
+                if self._index is None:
+                    self._index = await asyncio.to_thread(self._load_index, cutoff)
+        values, created_at, matrix = self._index
+        if not values:
+            return None
+
+        similarities: np.ndarray = np.where(created_at >= cutoff, matrix @ embedding, -1.0)
+        best: int = int(np.argmax(similarities))
+        if similarities[best] >= self.similarity_threshold:
+            self._pending_embeddings.pop(key, None)
+            return values[best]
+        return None
+
+    async def set(self, query: str, value: str) -> None:
+        """Store a value for the query, reusing the embedding computed by get()."""
+        key: str = self.make_key(query)
+        embedding: Optional[np.ndarray] = self._pending_embeddings.pop(key, None)
+        if embedding is None and self.semantic:
+            embedding = await self._embed(query)
+
+        created_at: float = time.time()
+        async with self._index_lock:
+            await asyncio.to_thread(self._insert, key, query, value, embedding, created_at)
+
+            if self._index is not None and embedding is not None:
+                values, created, matrix = self._index
+                self._index = (
+                    values + [value],
+                    np.append(created, created_at),
+                    np.vstack([matrix, embedding]) if values else embedding[np.newaxis, :],
+                )
+
+    def discard(self, query: str) -> None:
+        """Forget the embedding held for a query whose value will never be set."""
+        self._pending_embeddings.pop(self.make_key(query), None)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _fetch_exact(self, key: str, cutoff: float) -> Optional[str]:
+        """Look up an unexpired entry by exact key (runs in a worker thread)."""
+        with self._lock:
+            row: Optional[Tuple[str]] = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND created_at >= ?",
+                (key, cutoff),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def _load_index(self, cutoff: float) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Read all unexpired embeddings into a stacked matrix (runs in a worker thread)."""
+        with self._lock:
+            rows: List[Tuple[str, bytes, float]] = self._conn.execute(
+                "SELECT value, embedding, created_at FROM entries WHERE embedding IS NOT NULL AND created_at >= ?",
+                (cutoff,),
+            ).fetchall()
+        if not rows:
+            return [], np.empty(0), np.empty((0, 0), dtype=np.float32)
+        return (
+            [value for value, _, _ in rows],
+            np.array([created for _, _, created in rows]),
+            np.vstack([np.frombuffer(blob, dtype=np.float32) for _, blob, _ in rows]),
+        )
+
+    def _insert(
+        self, key: str, query: str, value: str, embedding: Optional[np.ndarray], created_at: float
+    ) -> None:
+        """Insert or replace an entry (runs in a worker thread)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, query, value, embedding, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, query, value, embedding.tobytes() if embedding is not None else None, created_at),
+            )
+            self._conn.commit()
+
+    async def _embed(self, query: str) -> Optional[np.ndarray]:
+        """Embed the query as a unit-length float32 vector (None if the API call fails)."""
+        if self._client is None:
+            self._client = AsyncOpenAI()
+        try:
+            response = await self._client.embeddings.create(model=EMBEDDING_MODEL, input=query.strip())
+        except Exception as e:
+            print(f"⚠️ Embedding failed, using exact cache only: {e}")
+            return None
+
+        vector: np.ndarray = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
@@ -5,9 +5,16 @@ Provides a clean interface for creating and managing the Gradio web UI.
 All Gradio-specific code is encapsulated here, following the facade pattern.
 """
 
-from typing import List, Optional, Callable, AsyncGenerator
+from typing import List, Optional, Callable, AsyncGenerator, Tuple
+import aiofiles
 import gradio as gr
+import os
+from operator import itemgetter
 from pathlib import Path
+import time
+
+# Page loads within this many seconds of the last listing reuse it without touching the disk
+REPORT_LIST_TTL_SECONDS: float = 2.0
 
 
 class GradioUIFacade:
@@ -22,20 +29,42 @@ class GradioUIFacade:
         self.outputs_dir: Path = outputs_dir
         self.outputs_dir.mkdir(exist_ok=True)
         self._deep_research_ui: Optional[gr.Blocks] = None
+        self._report_files_cache: Optional[Tuple[int, List[str]]] = None  # (dir mtime_ns, file names)
+        self._report_files_checked_at: float = 0.0
     
-    def get_report_files(self) -> List[str]:
-        """Get list of report files sorted by modification time (newest first)."""
+    def get_report_files(self, max_age: float = 0.0) -> List[str]:
+        """
+        Get list of report files sorted by modification time (newest first).
+        
+        Args:
+            max_age: Reuse the last listing without checking the directory if it is younger than this (seconds)
+        """
+        now: float = time.monotonic()
+        if self._report_files_cache is not None and now - self._report_files_checked_at < max_age:
+            return list(self._report_files_cache[1])
+        self._report_files_checked_at = now
+        
         if not self.outputs_dir.exists():
             return []
         
-        report_files: List[Path] = sorted(
-            self.outputs_dir.glob("report_*.md"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )
-        return [f.name for f in report_files]
+        # The directory mtime changes whenever a report is added or removed
+        dir_mtime_ns: int = self.outputs_dir.stat().st_mtime_ns
+        if self._report_files_cache is not None and self._report_files_cache[0] == dir_mtime_ns:
+            return list(self._report_files_cache[1])
+        
+        # Single scandir pass; DirEntry caches file type info from the directory read
+        with os.scandir(self.outputs_dir) as it:
+            entries: List[Tuple[str, float]] = [
+                (entry.name, entry.stat().st_mtime)
+                for entry in it
+                if entry.name.startswith("report_") and entry.name.endswith(".md") and entry.is_file()
+            ]
+        entries.sort(key=itemgetter(1), reverse=True)
+        names: List[str] = [name for name, _ in entries]
+        self._report_files_cache = (dir_mtime_ns, names)
+        return list(names)
     
-    def load_report(self, filename: Optional[str]) -> str:
+    async def load_report(self, filename: Optional[str]) -> str:
         """Load a report file and return its content."""
         if not filename or filename == "":
             return "Select a report to view..."
@@ -45,8 +74,8 @@ class GradioUIFacade:
             return f"⚠️ Report file not found: {filename}"
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()
+            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
+                return await f.read()
         except Exception as e:
             return f"⚠️ Error reading report: {str(e)}"
     
@@ -143,6 +172,10 @@ class GradioUIFacade:
                         """Refresh the dropdown with updated report file list."""
                         return gr.update(choices=self.get_report_files(), value=None)
                     
+                    def refresh_on_load():
+                        """Refresh the dropdown on page load, throttled across rapid reloads."""
+                        return gr.update(choices=self.get_report_files(max_age=REPORT_LIST_TTL_SECONDS), value=None)
+                    
                     refresh_button.click(
                         fn=refresh_on_select,
                         outputs=report_dropdown
@@ -150,7 +183,7 @@ class GradioUIFacade:
                     
                     # Auto-refresh dropdown when tab is selected
                     deep_research_ui.load(
-                        fn=refresh_on_select,
+                        fn=refresh_on_load,
                         outputs=report_dropdown
                     )
         
@@ -5,100 +5,418 @@ This class coordinates the agents to execute the complete
 research workflow: plan → search → write → save.
 """
 
-from typing import AsyncGenerator, List, Optional
-from agents import Agent, Runner
-from agents.result import RunResult
+from typing import AsyncGenerator, AsyncIterator, List, Optional, Set
+from agents import Agent, OpenAIProvider, RunConfig, Runner
+from agents.result import RunResult, RunResultStreaming
 from agents.tracing import trace, gen_trace_id
-from src.research.agents.planner_agent import WebSearchItem, WebSearchPlan
-from src.research.agents.writer_agent import ReportData
+from src.research.agents.planner_agent import WebSearchItem, WebSearchPlan, planner_agent
+from src.research.agents.search_agent import SearchSummaries, batch_search_agent, search_agent
+from src.research.agents.writer_agent import ReportData, writer_agent
+from src.research.cache import SemanticCache
+from openai import APIConnectionError, AsyncOpenAI, RateLimitError
+from openai.types.responses import ResponseTextDeltaEvent
+import aiofiles
 import asyncio
+import httpx
+import json
+import orjson
+import os
+import random
+import re
+import time
 from pathlib import Path
-from datetime import datetime
+from difflib import SequenceMatcher
+
+# Outputs directory - relative to project root
+OUTPUTS_DIR: Path = Path(__file__).parent.parent.parent / "outputs"
+
+# Anything other than letters, digits, underscore, space or hyphen is dropped from filenames
+_UNSAFE_FILENAME_CHARS: re.Pattern[str] = re.compile(r"[^\w \-]+")
+
+# Strong references to in-flight report saves, so they finish even if the caller stops iterating early
+_pending_saves: Set[asyncio.Task[str]] = set()
+
+# Sentences at least this similar to one in an earlier summary are dropped from the writer prompt
+DUPLICATE_SENTENCE_RATIO: float = 0.85
+# Shorter fragments (labels, headings) are kept even if repeated
+MIN_DEDUP_SENTENCE_CHARS: int = 30
+_SENTENCE_BOUNDARY: re.Pattern[str] = re.compile(r"(?<=[.!?])\s+")
+
+# Largest plan sent to the batch search agent; bigger plans keep the parallel path
+MAX_BATCH_SEARCHES: int = 8
+
+# Attempts per search when OpenAI rate-limits or drops the connection
+SEARCH_MAX_ATTEMPTS: int = 3
+
+
+class _SearchPlanParser:
+    """Incrementally extracts complete WebSearchItem objects from streamed WebSearchPlan JSON."""
+
+    def __init__(self) -> None:
+        self._buffer: str = ""
+        self._pos: Optional[int] = None  # Next unparsed index inside the "searches" array
+        self._decoder: json.JSONDecoder = json.JSONDecoder()
+
+    def feed(self, delta: str) -> List[WebSearchItem]:
+        """Append a chunk of streamed text and return any newly completed items."""
+        self._buffer += delta
+        if self._pos is None:
+            array_start: int = self._buffer.find("[")
+            if array_start == -1:
+                return []
+            self._pos = array_start + 1
+
+        items: List[WebSearchItem] = []
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n,":
+                self._pos += 1
+            if self._pos >= len(self._buffer) or self._buffer[self._pos] != "{":
+                return items
+            try:
+                obj, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                return items  # Item still streaming in
+            # Trusted output: structured outputs constrain the stream to the WebSearchPlan
+            # schema and the SDK validates the full plan at the end, so skip re-validation
+            items.append(WebSearchItem.model_construct(**obj))
+            self._pos = end
+
+
+def _is_near_duplicate(a: str, b: str) -> bool:
+    """Check two normalized sentences for near-duplication (cheap upper bounds first)."""
+    matcher: SequenceMatcher = SequenceMatcher(None, a, b, autojunk=False)
+    return (
+        matcher.real_quick_ratio() >= DUPLICATE_SENTENCE_RATIO
+        and matcher.quick_ratio() >= DUPLICATE_SENTENCE_RATIO
+        and matcher.ratio() >= DUPLICATE_SENTENCE_RATIO
+    )
+
+
+def _format_search_results(search_results: List[str]) -> str:
+    """Format summaries as numbered sections, dropping sentences already seen in an earlier summary."""
+    seen: List[str] = []
+    sections: List[str] = []
+    for summary in search_results:
+        kept_lines: List[str] = []
+        new_sentences: List[str] = []
+        for line in summary.strip().splitlines():
+            if not line.strip():
+                kept_lines.append("")
+                continue
+            kept: List[str] = []
+            for sentence in _SENTENCE_BOUNDARY.split(line.strip()):
+                normalized: str = " ".join(sentence.lower().split())
+                if len(normalized) >= MIN_DEDUP_SENTENCE_CHARS and any(_is_near_duplicate(normalized, prior) for prior in seen):
+                    continue
+                kept.append(sentence)
+                new_sentences.append(normalized)
+            if kept:
+                kept_lines.append(" ".join(kept))
+        seen.extend(new_sentences)
+        body: str = "\n".join(kept_lines).strip()
+        if body:
+            sections.append(f"### Source {len(sections) + 1}\n{body}")
+    return "\n\n".join(sections)
 
 
 class ResearchManager:
     """Orchestrates the deep research workflow across multiple agents."""
 
+    def __init__(
+        self,
+        search_cache: Optional[SemanticCache] = None,
+        plan_cache: Optional[SemanticCache] = None,
+        batch_searches: Optional[bool] = None,
+    ) -> None:
+        """
+        Initialize the research manager.
+        Args:
+            search_cache: Cache for search summaries (defaults to one under outputs/;
+                runs uncached if it can't be opened)
+            plan_cache: Cache for search plans keyed by query (defaults to one under outputs/;
+                runs uncached if it can't be opened)
+            batch_searches: Send uncached searches to the batch search agent in one call
+                (defaults to the SEARCH_BATCH environment variable)
+        """
+        if batch_searches is None:
+            batch_searches = os.getenv("SEARCH_BATCH", "0").lower() in ("1", "true", "yes")
+        self.batch_searches: bool = batch_searches
+        
+        # One pooled HTTP/2 client shared by every agent call and embedding lookup in this manager
+        self._http_client: httpx.AsyncClient = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(120.0, connect=10.0),
+        )
+        self._openai_client: AsyncOpenAI = AsyncOpenAI(http_client=self._http_client)
+        self._run_config: RunConfig = RunConfig(model_provider=OpenAIProvider(openai_client=self._openai_client))
+        
+        # Caches created here are owned (and closed) by this manager; injected ones are not
+        self._owned_caches: List[SemanticCache] = []
+        if search_cache is None:
+            search_cache = self._open_cache(OUTPUTS_DIR / ".search_cache.db")
+            if search_cache is not None:
+                self._owned_caches.append(search_cache)
+        if plan_cache is None:
+            # Exact match only: an embedding lookup would delay the planner on every cold run
+            plan_cache = self._open_cache(OUTPUTS_DIR / ".plan_cache.db", semantic=False)
+            if plan_cache is not None:
+                self._owned_caches.append(plan_cache)
+        self.search_cache: Optional[SemanticCache] = search_cache
+        self.plan_cache: Optional[SemanticCache] = plan_cache
+        self._search_semaphore: asyncio.Semaphore = asyncio.Semaphore(int(os.getenv("SEARCH_CONCURRENCY", "8")))
+
     async def run(self, query: str) -> AsyncGenerator[str, None]:
-        """Execute the complete research workflow and yield the final report."""
+        """
+        Execute the complete research workflow and yield the final report.
+        
+        The manager can run any number of queries; call aclose() when done with it.
+        """
         trace_id: str = gen_trace_id()
         print(f"🔍 Trace: https://platform.openai.com/traces/trace?trace_id={trace_id}")
         
         with trace("Deep Research", trace_id=trace_id):
-            from src.research.agents.planner_agent import planner_agent
-            from src.research.agents.search_agent import search_agent
-            from src.research.agents.writer_agent import writer_agent
-            
             print(f"📋 Planning searches...")
-            search_plan: WebSearchPlan = await self.plan_searches(query, planner_agent)
-            print(f"✅ Planned {len(search_plan.searches)} searches")
-            
-            print(f"🌐 Executing {len(search_plan.searches)} searches...")
-            search_results: List[str] = await self.perform_searches(search_plan, search_agent)
+            search_items: AsyncIterator[WebSearchItem] = self.plan_searches(query, planner_agent)
+            search_results: List[str] = [
+                result async for result in self.perform_searches(
+                    search_items, search_agent, batch_search_agent if self.batch_searches else None
+                )
+            ]
             print(f"✅ Completed {len(search_results)} searches")
             
             print(f"📝 Writing report...")
             report: ReportData = await self.write_report(query, search_results, writer_agent)
             print(f"✅ Report complete ({len(report.markdown_report)} chars)")
             
-            saved_path: str = await self.save_report(query, report)
-            print(f"💾 Saved: {saved_path}\n")
+            # Save in the background so the report reaches the caller without waiting on disk I/O
+            save_task: asyncio.Task[str] = asyncio.create_task(self.save_report(query, report))
+            _pending_saves.add(save_task)
+            save_task.add_done_callback(_pending_saves.discard)
             
             yield report.markdown_report
+            
+            saved_path: str = await save_task
+            print(f"💾 Saved: {saved_path}\n")
 
-    async def plan_searches(self, query: str, planner_agent: Agent) -> WebSearchPlan:
-        """Generate a search plan using the planner agent."""
-        result: RunResult = await Runner.run(planner_agent, f"Query: {query}")
-        return result.final_output_as(WebSearchPlan)
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and the caches this manager created."""
+        await self._http_client.aclose()
+        self.close()
 
-    async def perform_searches(self, search_plan: WebSearchPlan, search_agent: Agent) -> List[str]:
-        """Execute all searches in parallel."""
-        tasks: List[asyncio.Task[Optional[str]]] = [
-            asyncio.create_task(self.search(item, search_agent))
-            for item in search_plan.searches
-        ]
+    def close(self) -> None:
+        """
+        Close the caches this manager created.
+        
+        For shutdown after the event loop has stopped, when the HTTP client can no
+        longer be awaited; its connections are released with the process.
+        """
+        for cache in self._owned_caches:
+            cache.close()
+        self._owned_caches.clear()
+
+    async def plan_searches(self, query: str, planner_agent: Agent) -> AsyncGenerator[WebSearchItem, None]:
+        """Stream the search plan, yielding each search as soon as it is parsed."""
+        cached: Optional[str] = await self._cache_get(self.plan_cache, query)
+        if cached is not None:
+            print(f"♻️ Plan cache hit")
+            # Trusted output: written by us from an SDK-validated WebSearchPlan
+            for search in orjson.loads(cached)["searches"]:
+                yield WebSearchItem.model_construct(**search)
+            return
+        
+        result: RunResultStreaming = Runner.run_streamed(planner_agent, f"Query: {query}", run_config=self._run_config)
+        parser: _SearchPlanParser = _SearchPlanParser()
+        emitted: int = 0
         
-        results: List[str] = []
-        for task in asyncio.as_completed(tasks):
-            result: Optional[str] = await task
-            if result is not None:
-                results.append(result)
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                for item in parser.feed(event.data.delta):
+                    emitted += 1
+                    yield item
         
-        return results
+        # The SDK validates the complete plan; emit anything the incremental parser missed
+        search_plan: WebSearchPlan = result.final_output_as(WebSearchPlan)
+        await self._cache_set(self.plan_cache, query, search_plan.model_dump_json())
+        for item in search_plan.searches[emitted:]:
+            yield item
+
+    async def perform_searches(
+        self,
+        search_items: AsyncIterator[WebSearchItem],
+        search_agent: Agent,
+        batch_search_agent: Optional[Agent] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Start each search as soon as it is planned and yield summaries as they complete.
+        
+        With a batch_search_agent, the full plan is collected first and uncached searches
+        are sent in one call, falling back to parallel searches if the batch comes back short.
+        """
+        pending: Set[asyncio.Task[Optional[str]]] = set()
+        # Every task created below is cancelled on any early exit (planner failure, cancellation)
+        try:
+            if batch_search_agent is None:
+                async for item in search_items:
+                    pending.add(self._start_search(item, search_agent))
+                print(f"✅ Planned {len(pending)} searches")
+            else:
+                items: List[WebSearchItem] = [item async for item in search_items]
+                print(f"✅ Planned {len(items)} searches")
+                
+                cached_results: List[Optional[str]] = await asyncio.gather(
+                    *(self._cache_get(self.search_cache, item.query) for item in items)
+                )
+                uncached: List[WebSearchItem] = []
+                for item, cached in zip(items, cached_results):
+                    if cached is not None:
+                        print(f"♻️ Cache hit: {item.query}")
+                        yield cached
+                    else:
+                        uncached.append(item)
+                
+                if 1 < len(uncached) <= MAX_BATCH_SEARCHES:
+                    summaries: Optional[List[str]] = await self.batch_search(uncached, batch_search_agent)
+                    if summaries is not None:
+                        for summary in summaries:
+                            yield summary
+                        return
+                
+                for item in uncached:
+                    pending.add(self._start_search(item, search_agent))
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result: Optional[str] = task.result()
+                    if result is not None:
+                        yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _start_search(self, item: WebSearchItem, search_agent: Agent) -> asyncio.Task[Optional[str]]:
+        """Schedule a single search as a background task."""
+        print(f"🌐 Searching: {item.query}")
+        return asyncio.create_task(self.search(item, search_agent))
+
+    async def batch_search(self, items: List[WebSearchItem], batch_search_agent: Agent) -> Optional[List[str]]:
+        """Perform several web searches in one agent call (None if the batch fails or comes back short)."""
+        input_text: str = "\n".join(
+            f"[{i}] Search term: {item.query} — Reason for searching: {item.reason}"
+            for i, item in enumerate(items)
+        )
+        print(f"🌐 Batch searching {len(items)} terms...")
+        try:
+            async with self._search_semaphore:
+                result: RunResult = await Runner.run(batch_search_agent, input_text, run_config=self._run_config)
+        except Exception as e:
+            print(f"⚠️ Batch search failed, falling back to parallel searches - {e}")
+            return None
+        
+        summaries: List[str] = result.final_output_as(SearchSummaries).summaries
+        if len(summaries) != len(items):
+            print(f"⚠️ Batch returned {len(summaries)}/{len(items)} summaries, falling back to parallel searches")
+            return None
+        
+        for item, summary in zip(items, summaries):
+            await self._cache_set(self.search_cache, item.query, summary)
+        return summaries
 
     async def search(self, item: WebSearchItem, search_agent: Agent) -> Optional[str]:
-        """Perform a single web search."""
-        input_text: str = f"Search term: {item.query}\nReason for searching: {item.reason}"
+        """Perform a single web search, short-circuiting on a cache hit."""
+        cached: Optional[str] = await self._cache_get(self.search_cache, item.query)
+        if cached is not None:
+            print(f"♻️ Cache hit: {item.query}")
+            return cached
+        
         try:
-            result: RunResult = await Runner.run(search_agent, input_text)
-            return str(result.final_output)
+            input_text: str = f"Search term: {item.query}\nReason for searching: {item.reason}"
+            for attempt in range(SEARCH_MAX_ATTEMPTS):
+                try:
+                    async with self._search_semaphore:
+                        result: RunResult = await Runner.run(search_agent, input_text, run_config=self._run_config)
+                    summary: str = str(result.final_output)
+                except (RateLimitError, APIConnectionError) as e:
+                    if attempt == SEARCH_MAX_ATTEMPTS - 1:
+                        print(f"⚠️ Search failed after {SEARCH_MAX_ATTEMPTS} attempts: {item.query} - {e}")
+                        return None
+                    delay: float = 2 ** attempt + random.random()
+                    print(f"⏳ Retrying search in {delay:.1f}s: {item.query} - {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                except Exception as e:
+                    print(f"⚠️ Search failed: {item.query} - {e}")
+                    return None
+                
+                await self._cache_set(self.search_cache, item.query, summary)
+                return summary
+            return None
+        finally:
+            # No-op after a successful set(); drops the held embedding on failure or cancellation
+            self._cache_discard(self.search_cache, item.query)
+
+    def _open_cache(self, db_path: Path, semantic: bool = True) -> Optional[SemanticCache]:
+        """Open a default cache, or return None (run uncached) if the database is unusable."""
+        try:
+            return SemanticCache(db_path, client=self._openai_client, semantic=semantic)
+        except Exception as e:
+            print(f"⚠️ Cache unavailable, running without it: {db_path.name} - {e}")
+            return None
+
+    async def _cache_get(self, cache: Optional[SemanticCache], query: str) -> Optional[str]:
+        """Read from a cache, treating any failure as a miss."""
+        if cache is None:
+            return None
+        try:
+            return await cache.get(query)
         except Exception as e:
-            print(f"⚠️ Search failed: {item.query} - {e}")
+            print(f"⚠️ Cache read failed: {query} - {e}")
             return None
 
+    def _cache_discard(self, cache: Optional[SemanticCache], query: str) -> None:
+        """Release anything a cache holds for a query that won't be stored."""
+        if cache is not None:
+            cache.discard(query)
+
+    async def _cache_set(self, cache: Optional[SemanticCache], query: str, value: str) -> None:
+        """Write to a cache, logging failures instead of losing the (already paid for) result."""
+        if cache is None:
+            return
+        try:
+            await cache.set(query, value)
+        except Exception as e:
+            print(f"⚠️ Cache write failed: {query} - {e}")
+
     async def write_report(self, query: str, search_results: List[str], writer_agent: Agent) -> ReportData:
         """Synthesize search results into a comprehensive report."""
-        input_text: str = f"Original query: {query}\n\nSummarized search results:\n{search_results}"
-        result: RunResult = await Runner.run(writer_agent, input_text)
+        input_text: str = f"Original query: {query}\n\nSummarized search results:\n\n{_format_search_results(search_results)}"
+        result: RunResult = await Runner.run(writer_agent, input_text, run_config=self._run_config)
         return result.final_output_as(ReportData)
     
     async def save_report(self, query: str, report: ReportData) -> str:
         """Save report to a markdown file."""
-        project_root: Path = Path(__file__).parent.parent.parent
-        outputs_dir: Path = project_root / "outputs"
+        outputs_dir: Path = OUTPUTS_DIR
         outputs_dir.mkdir(exist_ok=True)
         
-        timestamp: str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        safe_query: str = "".join(c for c in query[:50] if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+        now: time.struct_time = time.localtime()
+        timestamp: str = time.strftime("%Y-%m-%d_%H-%M-%S", now)
+        safe_query: str = _UNSAFE_FILENAME_CHARS.sub("", query[:50]).strip().replace(' ', '_')
         filename: str = f"report_{timestamp}_{safe_query}.md"
         filepath: Path = outputs_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"# Research Report\n\n**Query:** {query}\n\n")
-            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n---\n\n")
-            f.write(f"## Summary\n\n{report.short_summary}\n\n---\n\n")
-            f.write(f"{report.markdown_report}\n\n---\n\n## Follow-up Questions\n\n")
-            f.write("\n".join(f"- {q}" for q in report.follow_up_questions))
+        # Write the pieces as-is rather than interpolating the (large) report into new strings
+        chunks: List[str] = [
+            "# Research Report\n\n**Query:** ", query, "\n\n",
+            "**Generated:** ", time.strftime("%Y-%m-%d %H:%M:%S", now), "\n\n---\n\n",
+            "## Summary\n\n", report.short_summary, "\n\n---\n\n",
+            report.markdown_report, "\n\n---\n\n## Follow-up Questions\n\n",
+        ]
+        for index, question in enumerate(report.follow_up_questions):
+            chunks.extend(("\n- " if index else "- ", question))
+        
+        async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
+            await f.writelines(chunks)
         
         return str(filepath)
 